@@ -2,6 +2,7 @@
 CameraManager class for handling camera setup, image capture, and saving in Isaac Sim.
 """
 
+from pathlib import Path
 import numpy as np
 import imageio
 from typing import Optional, Tuple
@@ -10,22 +11,29 @@ import omni.usd
 from omni.isaac.sensor import Camera
 from pxr import UsdGeom
 
+from keyframe_selector import KeyframeSelector
+from point_cloud import PointCloudGenerator
+
 
 class CameraManager:
     """A class to manage camera setup, image capture, and saving."""
     
     def __init__(self, prim_path: str = "/World/MyCamera", 
-                 position: Tuple[float, float, float] = (0, 0, 5)):
+                 position: Tuple[float, float, float] = (0, 0, 5),
+                 keyframe_selector: Optional[KeyframeSelector] = None):
         """
         Initialize camera manager.
         
         Args:
             prim_path: Camera prim path in the scene
             position: Camera position as (x, y, z) tuple
+            keyframe_selector: If set, only frames it selects are saved
         """
         self.prim_path = prim_path
         self.position = position
         self.camera: Optional[Camera] = None
+        self.keyframe_selector = keyframe_selector
+        self.point_cloud_generator = PointCloudGenerator()
         
         self._setup_camera()
     
@@ -50,7 +58,8 @@ class CameraManager:
         
         Args:
             frame_number: Current frame number
-            save_interval: Save images every N frames
+            save_interval: Save images every N frames, ignored when a
+                keyframe selector is set
         """
         if self.camera is None:
             return
@@ -70,11 +79,68 @@ class CameraManager:
             center_distance = depth_image[center_y, center_x]
             print(f"Center pixel ({center_x}, {center_y}) distance: {center_distance:.3f}")
         
+        # Save images only if the frame shows enough motion
+        if self.keyframe_selector is not None:
+            motion_vectors = camera_data.get('motion_vectors')
+            if self.keyframe_selector.update(frame_number, motion_vectors, depth_image):
+                self._save_rgb_image(rgb_img, frame_number)
+                self._save_depth_image(depth_image, frame_number)
+            return
+        
         # Save images if it's a save frame
         # if frame_number % save_interval == 0:
         #     self._save_rgb_image(rgb_img, frame_number)
         #     self._save_depth_image(depth_image, frame_number)
     
+    def save_keyframe_index(self, last_frame: int,
+                            path: Path = Path("keyframe_index.json")):
+        """
+        Finalize the keyframe selector and write its index next to the saved images.
+        
+        Args:
+            last_frame: Last frame number passed to capture_and_save_images
+            path: Output path of the JSON index
+        """
+        if self.keyframe_selector is None:
+            return
+        
+        self.keyframe_selector.finalize(last_frame)
+        self.keyframe_selector.save_index(path)
+        print(f"Saved {path} with {len(self.keyframe_selector.index)} keyframes")
+    
+    def get_point_cloud(self, with_rgb: bool = False,
+                        voxel_size: Optional[float] = None
+                        ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Back-project the current depth frame into a world-frame point cloud.
+        
+        Args:
+            with_rgb: Also return a color per point
+            voxel_size: If set, downsample the cloud to this voxel size
+            
+        Returns:
+            Tuple of points (N, 3) and float32 colors (N, 3) or None. Without
+            voxel_size these are views into buffers that the next call
+            overwrites, copy them to keep a cloud across frames.
+        """
+        if self.camera is None:
+            return None, None
+        
+        depth_image = self.camera.get_current_frame().get('distance_to_image_plane')
+        if depth_image is None:
+            return None, None
+        
+        position, orientation = self.camera.get_world_pose(camera_axes="ros")
+        rgb_img = self.camera.get_rgb() if with_rgb else None
+        return self.point_cloud_generator.generate(
+            depth_image,
+            self.camera.get_intrinsics_matrix(),
+            position,
+            orientation,
+            rgb=rgb_img,
+            voxel_size=voxel_size,
+        )
+    
     def _save_rgb_image(self, rgb_img: Optional[np.ndarray], frame_number: int):
         """Save RGB image to file."""
         if rgb_img is not None:
@@ -0,0 +1,175 @@
+"""
+KeyframeSelector class for skipping near-static frames during camera recording.
+"""
+
+import json
+from pathlib import Path
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class KeyframeSelector:
+    """
+    A class to decide which camera frames are worth recording.
+
+    Each frame is scored by the fraction of pixels whose motion vector exceeds
+    a flow threshold, so a small moving robot in a mostly static view still
+    registers. This is optionally combined with the fraction of pixels whose
+    downsampled depth changed since the last recorded frame. A frame is recorded when the score crosses the threshold
+    or when max_gap frames have passed since the last recorded one. Skipped
+    ranges are kept in the index so frame timing can be reconstructed.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.01,
+        max_gap: int = 30,
+        stride: int = 4,
+        flow_threshold: float = 1.0,
+        depth_weight: float = 0.0,
+        depth_threshold: float = 0.01,
+    ):
+        """
+        Initialize keyframe selector.
+
+        Args:
+            threshold: Minimum motion score (fraction of moving pixels) for a
+                frame to be recorded
+            max_gap: Record a frame at least every max_gap frames
+            stride: Pixel stride used to subsample the motion and depth buffers
+            flow_threshold: Motion in pixels per frame above which a pixel moves
+            depth_weight: Weight of the fraction of changed depth pixels in the
+                score, 0 disables the depth term
+            depth_threshold: Depth change in meters above which a pixel changed
+        """
+        self.threshold = threshold
+        self.max_gap = max_gap
+        self.stride = stride
+        self.flow_threshold = flow_threshold
+        self.depth_weight = depth_weight
+        self.depth_threshold = depth_threshold
+
+        self.index: List[Dict] = []
+        self.tail_skipped: Optional[Tuple[int, int]] = None
+        self._last_recorded: Optional[int] = None
+        self._last_depth: Optional[np.ndarray] = None
+
+    def motion_score(
+        self, motion_vectors: Optional[np.ndarray], depth: Optional[np.ndarray] = None
+    ) -> float:
+        """
+        Compute the motion score of a frame.
+
+        Args:
+            motion_vectors: Motion-vector buffer of shape (H, W, C), the first two
+                channels are the per-pixel screen-space motion in pixels
+            depth: Optional distance_to_image_plane buffer of shape (H, W)
+
+        Returns:
+            Fraction of moving pixels plus the weighted fraction of changed
+            depth pixels, non-finite pixels are ignored
+        """
+        score = 0.0
+        if motion_vectors is not None and motion_vectors.size > 0:
+            flow = motion_vectors[:: self.stride, :: self.stride, :2]
+            # Compare squared magnitudes to skip the square root
+            squared = np.einsum("ijk,ijk->ij", flow, flow)
+            score += self._fraction_above(squared, self.flow_threshold**2)
+
+        if self.depth_weight > 0.0 and depth is not None and self._last_depth is not None:
+            delta = np.abs(self._downsample(depth) - self._last_depth)
+            score += self.depth_weight * self._fraction_above(
+                delta, self.depth_threshold
+            )
+        return score
+
+    def update(
+        self,
+        frame_number: int,
+        motion_vectors: Optional[np.ndarray],
+        depth: Optional[np.ndarray] = None,
+    ) -> bool:
+        """
+        Score a frame and decide whether it should be recorded.
+
+        Args:
+            frame_number: Current frame number
+            motion_vectors: Motion-vector buffer of shape (H, W, C)
+            depth: Optional distance_to_image_plane buffer of shape (H, W)
+
+        Returns:
+            bool: True if the frame should be recorded
+        """
+        score = self.motion_score(motion_vectors, depth)
+        gap = (
+            None
+            if self._last_recorded is None
+            else frame_number - self._last_recorded
+        )
+        if gap is not None and score < self.threshold and gap < self.max_gap:
+            return False
+
+        skipped = self._skipped_range(frame_number)
+        self.index.append(
+            {
+                "frame": frame_number,
+                "score": score,
+                "skipped": list(skipped) if skipped else None,
+            }
+        )
+        self._last_recorded = frame_number
+        if self.depth_weight > 0.0 and depth is not None:
+            self._last_depth = self._downsample(depth)
+        return True
+
+    def skipped_ranges(self) -> List[Tuple[int, int]]:
+        """Return the inclusive (start, end) frame ranges that were not recorded."""
+        ranges = [tuple(entry["skipped"]) for entry in self.index if entry["skipped"]]
+        if self.tail_skipped is not None:
+            ranges.append(self.tail_skipped)
+        return ranges
+
+    def finalize(self, last_frame: int):
+        """
+        Close the recording, logging the frames skipped after the last recorded one.
+
+        Args:
+            last_frame: Last frame number that was passed to update
+        """
+        self.tail_skipped = self._skipped_range(last_frame + 1)
+
+    def save_index(self, path: Path):
+        """Write the recorded frames and skipped ranges to a JSON file."""
+        tail = list(self.tail_skipped) if self.tail_skipped else None
+        with open(path, "w") as f:
+            json.dump(
+                {"max_gap": self.max_gap, "frames": self.index, "tail_skipped": tail},
+                f,
+                indent=2,
+            )
+
+    def reset(self):
+        """Forget all recorded frames, e.g. at the start of a new recording."""
+        self.index = []
+        self.tail_skipped = None
+        self._last_recorded = None
+        self._last_depth = None
+
+    def _skipped_range(self, frame_number: int) -> Optional[Tuple[int, int]]:
+        """Range of frames skipped between the last recorded frame and this one."""
+        if self._last_recorded is None or frame_number - self._last_recorded <= 1:
+            return None
+        return (self._last_recorded + 1, frame_number - 1)
+
+    @staticmethod
+    def _fraction_above(values: np.ndarray, threshold: float) -> float:
+        """Fraction of the finite values above threshold, 0 if none are finite."""
+        finite = np.isfinite(values)
+        count = np.count_nonzero(finite)
+        if count == 0:
+            return 0.0
+        return np.count_nonzero(finite & (values > threshold)) / count
+
+    def _downsample(self, depth: np.ndarray) -> np.ndarray:
+        """Subsample the depth buffer with the configured stride."""
+        return np.array(depth[:: self.stride, :: self.stride], dtype=np.float32)
@@ -0,0 +1,234 @@
+"""
+PointCloudGenerator class for turning depth images into world-frame point clouds.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from transforms3d.quaternions import quat2mat
+
+# Voxel grids up to this many cells are grouped by direct addressing
+DENSE_GRID_CELLS = 1 << 24
+
+
+def voxel_downsample(
+    points: np.ndarray, voxel_size: float, colors: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Downsample a point cloud to one centroid per occupied voxel.
+
+    The grid is anchored at the minimum corner of the cloud. When the
+    bounding grid is small relative to the cloud, the linear voxel index is
+    used as a direct-address hash and points are grouped with bincount in
+    O(N). Larger grids fall back to sorting packed int64 keys (21 bits per
+    axis), or to a row-wise unique when an axis spans more voxels than fit
+    in 21 bits.
+
+    Args:
+        points: Points as (N, 3) array
+        voxel_size: Voxel edge length in meters
+        colors: Optional per-point colors as (N, C) array
+
+    Returns:
+        Tuple of downsampled points (M, 3) and colors (M, C) or None
+    """
+    if len(points) == 0:
+        return points, colors
+
+    # Anchoring the grid at the cloud minimum keeps indices non-negative, so
+    # truncation matches floor
+    voxels = ((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+    extent = voxels.max(axis=0) + 1
+    cells = int(extent[0]) * int(extent[1]) * int(extent[2])
+
+    if cells <= max(DENSE_GRID_CELLS, 4 * len(points)):
+        keys = (voxels[:, 0] * extent[1] + voxels[:, 1]) * extent[2] + voxels[:, 2]
+        counts = np.bincount(keys, minlength=cells)
+        occupied = np.flatnonzero(counts)
+        counts = counts[occupied]
+
+        def _sums(weights: np.ndarray) -> np.ndarray:
+            return np.bincount(keys, weights=weights, minlength=cells)[occupied]
+
+    else:
+        if np.all(extent <= 1 << 21):
+            keys = (voxels[:, 0] << 42) | (voxels[:, 1] << 21) | voxels[:, 2]
+            _, inverse, counts = np.unique(
+                keys, return_inverse=True, return_counts=True
+            )
+        else:
+            _, inverse, counts = np.unique(
+                voxels, axis=0, return_inverse=True, return_counts=True
+            )
+        inverse = inverse.reshape(-1)
+
+        def _sums(weights: np.ndarray) -> np.ndarray:
+            return np.bincount(inverse, weights=weights)
+
+    def _mean(values: np.ndarray) -> np.ndarray:
+        dtype = np.result_type(values.dtype, np.float32)
+        out = np.empty((len(counts), values.shape[1]), dtype=dtype)
+        for axis in range(values.shape[1]):
+            out[:, axis] = _sums(values[:, axis]) / counts
+        return out
+
+    return _mean(points), (_mean(colors) if colors is not None else None)
+
+
+class PointCloudGenerator:
+    """
+    A class to back-project depth images into world-frame XYZ points.
+
+    Per-pixel ray directions are computed once for the camera intrinsics,
+    resolution, stride and ROI, and are rebuilt only when one of them changes.
+    Each frame the valid pixels are compacted first, so rotation, scale and
+    offset only run over pixels with depth. Points are kept one coordinate per
+    row so every step is a contiguous 1D operation or a single (3, 3) x (3, N)
+    matmul. This happens in buffers allocated with the rays, so the arrays
+    returned by generate are overwritten by the next call.
+    """
+
+    def __init__(
+        self,
+        stride: int = 1,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        max_depth: float = np.inf,
+    ):
+        """
+        Initialize point cloud generator.
+
+        Args:
+            stride: Use every Nth pixel in both image directions
+            roi: Optional region of interest as (x_min, y_min, x_max, y_max) pixels,
+                clamped to the image
+            max_depth: Depths at or beyond this distance are dropped
+        """
+        self.stride = stride
+        self.roi = roi
+        self.max_depth = max_depth
+
+        self._cache_key: Optional[Tuple] = None
+        self._window: Tuple[slice, slice] = (slice(0), slice(0))
+        self._ray_x = np.empty(0, dtype=np.float32)
+        self._ray_y = np.empty(0, dtype=np.float32)
+        self._camera_points = np.empty((3, 0), dtype=np.float32)
+        self._points = np.empty((3, 0), dtype=np.float32)
+        self._colors = np.empty((3, 0), dtype=np.float32)
+        self._depth = np.empty((0, 0), dtype=np.float32)
+        self._valid = np.empty(0, dtype=bool)
+        self._in_range = np.empty(0, dtype=bool)
+
+    def _clamped_roi(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        """
+        Clamp the ROI to the image bounds.
+
+        Raises:
+            ValueError: If the ROI does not overlap the image
+        """
+        x_min, y_min, x_max, y_max = self.roi or (0, 0, width, height)
+        x_min, x_max = max(0, x_min), min(width, x_max)
+        y_min, y_max = max(0, y_min), min(height, y_max)
+        if x_min >= x_max or y_min >= y_max:
+            raise ValueError(
+                f"ROI {self.roi} does not overlap the {width}x{height} image"
+            )
+        return x_min, y_min, x_max, y_max
+
+    def _update_rays(self, intrinsics: np.ndarray, width: int, height: int):
+        """Rebuild the cached optical-frame rays and buffers if they are stale."""
+        roi = self._clamped_roi(width, height)
+        key = (intrinsics.tobytes(), width, height, self.stride, roi)
+        if key == self._cache_key:
+            return
+
+        x_min, y_min, x_max, y_max = roi
+        u = np.arange(x_min, x_max, self.stride, dtype=np.float32)
+        v = np.arange(y_min, y_max, self.stride, dtype=np.float32)
+        fx, fy = intrinsics[0, 0], intrinsics[1, 1]
+        cx, cy = intrinsics[0, 2], intrinsics[1, 2]
+
+        # Rays in the optical frame (x right, y down, z forward) with unit z,
+        # so scaling by distance_to_image_plane gives the 3D point
+        count = len(u) * len(v)
+        self._ray_x = np.broadcast_to((u - cx) / fx, (len(v), len(u))).reshape(-1)
+        self._ray_y = np.repeat((v - cy) / fy, len(u))
+        self._window = (
+            slice(y_min, y_max, self.stride),
+            slice(x_min, x_max, self.stride),
+        )
+        self._camera_points = np.empty((3, count), dtype=np.float32)
+        self._points = np.empty((3, count), dtype=np.float32)
+        self._colors = np.empty((3, count), dtype=np.float32)
+        self._depth = np.empty((len(v), len(u)), dtype=np.float32)
+        self._valid = np.empty(count, dtype=bool)
+        self._in_range = np.empty(count, dtype=bool)
+        self._cache_key = key
+
+    def generate(
+        self,
+        depth: np.ndarray,
+        intrinsics: np.ndarray,
+        position: np.ndarray,
+        orientation: np.ndarray,
+        rgb: Optional[np.ndarray] = None,
+        voxel_size: Optional[float] = None,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Convert a depth image into a world-frame point cloud.
+
+        Args:
+            depth: distance_to_image_plane image of shape (H, W)
+            intrinsics: 3x3 camera intrinsics matrix
+            position: Camera position as numpy array [x, y, z]
+            orientation: Camera quaternion [w, x, y, z] in the ROS optical
+                convention (x right, y down, z forward)
+            rgb: Optional color image of shape (H, W, C)
+            voxel_size: If set, downsample the result to this voxel size
+
+        Returns:
+            Tuple of points (N, 3) and float32 colors (N, 3) or None. Without
+            voxel_size these are views into internal buffers reused by the
+            next call.
+        """
+        height, width = depth.shape[:2]
+        self._update_rays(np.asarray(intrinsics, dtype=np.float32), width, height)
+
+        window = depth[self._window]
+        if window.dtype == np.float32 and window.flags.c_contiguous:
+            d = window.reshape(-1)
+        else:
+            np.copyto(self._depth, window)
+            d = self._depth.reshape(-1)
+        # NaN and inf fail both comparisons, so no separate isfinite pass
+        np.greater(d, 0.0, out=self._valid)
+        np.less(d, self.max_depth, out=self._in_range)
+        np.logical_and(self._valid, self._in_range, out=self._valid)
+
+        # Compact the valid pixels first so the math below skips the rest
+        indices = np.flatnonzero(self._valid)
+        count = len(indices)
+        camera_points = self._camera_points[:, :count]
+        np.take(self._ray_x, indices, out=camera_points[0])
+        np.take(self._ray_y, indices, out=camera_points[1])
+        np.take(d, indices, out=camera_points[2])
+        camera_points[0] *= camera_points[2]
+        camera_points[1] *= camera_points[2]
+
+        # p_world = R @ (d * ray) + t over the valid subset only
+        rotation = quat2mat(orientation).astype(np.float32)
+        points = self._points[:, :count]
+        np.matmul(rotation, camera_points, out=points)
+        points += np.asarray(position, dtype=np.float32)[:, None]
+        points = points.T
+
+        colors = None
+        if rgb is not None:
+            colors = self._colors[:, :count]
+            pixels = rgb[self._window].reshape(-1, rgb.shape[-1])
+            for channel in range(3):
+                np.take(pixels[:, channel], indices, out=colors[channel])
+            colors = colors.T
+
+        if voxel_size is not None:
+            points, colors = voxel_downsample(points, voxel_size, colors)
+        return points, colors
@@ -0,0 +1,245 @@
+"""
+PropManager class for bulk spawning and re-posing of cuboid props in Isaac Sim.
+"""
+
+import numpy as np
+from typing import Optional, Sequence, Tuple, Union
+
+import omni.usd
+from isaacsim.core.prims import RigidPrim
+from pxr import Gf, Sdf, UsdGeom, Vt
+
+from my_utils import Color
+
+ColorsLike = Union[np.ndarray, Sequence[Color]]
+
+# Where unused pooled props are parked, above the ground plane since it
+# acts as a half-space collider
+PARKING_Z = 100.0
+
+
+def colors_to_array(colors: ColorsLike, count: int) -> np.ndarray:
+    """
+    Convert a sequence of Color values or an (N, 3) array to an (N, 3) float array.
+
+    A single Color is broadcast to all props.
+
+    Raises:
+        ValueError: If the number of colors does not match count
+    """
+    if isinstance(colors, Color):
+        return np.tile(colors.as_array(), (count, 1))
+    if len(colors) > 0 and isinstance(colors[0], Color):
+        if len(colors) != count:
+            raise ValueError(f"Expected {count} colors, got {len(colors)}")
+        return np.array([color.value for color in colors], dtype=float)
+    return np.asarray(colors, dtype=float).reshape(count, 3)
+
+
+def random_layout(
+    count: int,
+    bounds_min: np.ndarray,
+    bounds_max: np.ndarray,
+    size_range: Tuple[float, float] = (0.05, 0.15),
+    colors: Sequence[Color] = tuple(Color),
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate a random clutter layout of cuboid props.
+
+    Args:
+        count: Number of props
+        bounds_min: Lower corner [x, y, z] of the spawn volume
+        bounds_max: Upper corner [x, y, z] of the spawn volume
+        size_range: Min and max edge length of each prop
+        colors: Colors to sample from
+        rng: Random generator, a fresh default one is used if None
+
+    Returns:
+        Tuple of positions (N, 3), sizes (N, 3) and colors (N, 3)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    positions = rng.uniform(bounds_min, bounds_max, size=(count, 3))
+    sizes = rng.uniform(size_range[0], size_range[1], size=(count, 3))
+    palette = np.array([color.value for color in colors], dtype=float)
+    rgb = palette[rng.integers(0, len(palette), size=count)]
+    return positions, sizes, rgb
+
+
+class PropManager:
+    """
+    A class to manage a pool of cuboid props driven through a single batched view.
+
+    Props are authored directly on the stage instead of one DynamicCuboid and
+    scene registry entry per cube. Between episodes the pool is re-posed in
+    place; props that are not needed are hidden and parked apart from each
+    other with gravity disabled, so they stay asleep without their rigid
+    bodies being rebuilt.
+
+    Growing the pool while the world is playing resets the world so the new
+    view is initialized against the running physics simulation.
+    """
+
+    def __init__(self, world, root_path: str = "/World/Props", name: str = "props"):
+        """
+        Initialize prop manager.
+
+        Args:
+            world: The Isaac Sim world instance
+            root_path: Prim path under which the props are authored
+            name: Name of the batched view in the scene registry
+        """
+        self.world = world
+        self.root_path = root_path
+        self.name = name
+        self.view: Optional[RigidPrim] = None
+
+        self._layer: Optional[Sdf.Layer] = None
+
+        self._pool_size = 0
+        self._active_count = 0
+        self._colors = np.zeros((0, 3))
+
+    @property
+    def count(self) -> int:
+        """Number of props currently in use."""
+        return self._active_count
+
+    def spawn(
+        self, positions: np.ndarray, sizes: np.ndarray, colors: ColorsLike
+    ) -> RigidPrim:
+        """
+        Place props at the given poses, growing the pool only when needed.
+
+        Args:
+            positions: Prop positions as (N, 3) array
+            sizes: Prop edge lengths as (N, 3) array
+            colors: Sequence of N Color values, a single Color or an (N, 3) array
+
+        Returns:
+            The batched RigidPrim view over the whole pool
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        count = len(positions)
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=float), (count, 3))
+        rgb = colors_to_array(colors, count)
+
+        if count > self._pool_size:
+            self._grow_pool(count)
+
+        self._set_colors(rgb)
+        self._apply(positions, sizes)
+        return self.view  # type: ignore
+
+    def get_poses(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read back the poses of all active props in one batched call.
+
+        Returns:
+            Tuple of positions (N, 3) and quaternions (N, 4) in [w, x, y, z] format
+        """
+        if self.view is None or self._active_count == 0:
+            return np.zeros((0, 3)), np.zeros((0, 4))
+        indices = np.arange(self._active_count)
+        positions, orientations = self.view.get_world_poses(indices=indices)
+        return np.asarray(positions), np.asarray(orientations)
+
+    def _grow_pool(self, count: int):
+        """Author the missing prop prims and rebuild the batched view."""
+        stage = omni.usd.get_context().get_stage()
+        UsdGeom.Xform.Define(stage, self.root_path)
+        # Colors are later edited on the same layer the props were authored in
+        if self._layer is None:
+            self._layer = stage.GetEditTarget().GetLayer()
+        layer = self._layer
+
+        # Only Sdf-level authoring is allowed inside a change block
+        with Sdf.ChangeBlock():
+            for index in range(self._pool_size, count):
+                spec = Sdf.CreatePrimInLayer(layer, f"{self.root_path}/prop_{index}")
+                spec.specifier = Sdf.SpecifierDef
+                spec.typeName = "Cube"
+                spec.SetInfo(
+                    "apiSchemas",
+                    Sdf.TokenListOp.Create(
+                        prependedItems=["PhysicsRigidBodyAPI", "PhysicsCollisionAPI"]
+                    ),
+                )
+                size = Sdf.AttributeSpec(spec, "size", Sdf.ValueTypeNames.Double)
+                size.default = 1.0
+                color = Sdf.AttributeSpec(
+                    spec, "primvars:displayColor", Sdf.ValueTypeNames.Color3fArray
+                )
+                color.default = Vt.Vec3fArray([Gf.Vec3f(0.5, 0.5, 0.5)])
+
+        self._colors = np.vstack(
+            [self._colors, np.full((count - self._pool_size, 3), np.nan)]
+        )
+        self._pool_size = count
+
+        # The view is bound to the prims that exist when it is created
+        if self.view is not None and self.world.scene.object_exists(self.name):
+            self.world.scene.remove_object(self.name, registry_only=True)
+        self.view = self.world.scene.add(  # type: ignore
+            RigidPrim(
+                prim_paths_expr=f"{self.root_path}/prop_.*",
+                name=self.name,
+            )
+        )
+        if self.world.is_playing():
+            self.world.reset()
+
+    def _set_colors(self, rgb: np.ndarray):
+        """Write display colors, skipping props whose color is unchanged."""
+        layer = self._layer
+        if layer is None:
+            return
+        changed = np.flatnonzero(np.any(self._colors[: len(rgb)] != rgb, axis=1))
+        if changed.size == 0:
+            return
+        with Sdf.ChangeBlock():
+            for index in changed:
+                attr = layer.GetAttributeAtPath(
+                    f"{self.root_path}/prop_{index}.primvars:displayColor"
+                )
+                attr.default = Vt.Vec3fArray([Gf.Vec3f(*rgb[index])])
+        self._colors[: len(rgb)] = rgb
+
+    def _apply(self, positions: np.ndarray, sizes: np.ndarray):
+        """Re-pose the active props and park the rest of the pool."""
+        view = self.view
+        if view is None:
+            return
+        count = len(positions)
+        previous = self._active_count
+
+        # Parked props are spread along x so they never overlap
+        all_positions = np.zeros((self._pool_size, 3))
+        all_positions[:count] = positions
+        all_positions[count:, 0] = np.arange(self._pool_size - count)
+        all_positions[count:, 2] = PARKING_Z
+        orientations = np.tile([1.0, 0.0, 0.0, 0.0], (self._pool_size, 1))
+        scales = np.ones((self._pool_size, 3))
+        scales[:count] = sizes
+
+        view.set_world_poses(all_positions, orientations)
+        # Keep world.reset() from moving the props back to where they were authored
+        view.set_default_state(positions=all_positions, orientations=orientations)
+        view.set_local_scales(scales)
+
+        # Only touch the props whose active state changes, the rigid bodies
+        # themselves stay enabled so PhysX never rebuilds them
+        if count > previous:
+            woken = np.arange(previous, count)
+            view.enable_gravities(indices=woken)
+            view.set_visibilities(np.ones(len(woken), dtype=bool), indices=woken)
+        elif count < previous:
+            parked = np.arange(count, previous)
+            view.disable_gravities(indices=parked)
+            view.set_visibilities(np.zeros(len(parked), dtype=bool), indices=parked)
+            if self.world.is_playing():
+                view.set_velocities(np.zeros((len(parked), 6)), indices=parked)
+
+        if self.world.is_playing() and count > 0:
+            view.set_velocities(np.zeros((count, 6)), indices=np.arange(count))
+        self._active_count = count
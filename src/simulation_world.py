@@ -4,7 +4,7 @@ SimulationWorld class for managing the overall simulation environment in Isaac S
 
 from pathlib import Path
 import numpy as np
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from isaacsim.core.api import World
 from isaacsim.core.api.objects import DynamicCuboid
@@ -12,26 +12,40 @@ from isaacsim.core.utils.stage import add_reference_to_stage
 
 from robot import Robot
 from camera_manager import CameraManager
+from keyframe_selector import KeyframeSelector
+from prop_manager import ColorsLike, PropManager, random_layout
 
 
 class SimulationWorld:
     """Main class to manage the simulation world and coordinate all components."""
 
     def __init__(
-        self, load_ground_plane: bool = True, world_usd_path: Optional[Path] = None
+        self,
+        load_ground_plane: bool = True,
+        world_usd_path: Optional[Path] = None,
+        keyframe_selector: Optional[KeyframeSelector] = None,
     ):
         """
         Initialize the simulation world.
 
+        Args:
+            load_ground_plane: Add the default ground plane
+            world_usd_path: Optional USD file referenced as the environment
+            keyframe_selector: If set, camera frames it selects are recorded
+                while the simulation runs
         """
         self.world = World()
         self.robots: List[Robot] = []
         self.camera_manager: Optional[CameraManager] = None
+        self.prop_manager = PropManager(self.world)
 
-        self._setup_world(load_ground_plane, world_usd_path)
+        self._setup_world(load_ground_plane, world_usd_path, keyframe_selector)
 
     def _setup_world(
-        self, load_ground_plane: bool = True, world_usd_path: Optional[Path] = None
+        self,
+        load_ground_plane: bool = True,
+        world_usd_path: Optional[Path] = None,
+        keyframe_selector: Optional[KeyframeSelector] = None,
     ):
         """Set up the basic world environment."""
         # Add default ground plane
@@ -42,7 +56,7 @@ class SimulationWorld:
             add_reference_to_stage(str(world_usd_path), "/World/Environment")
 
         # Set up camera
-        self.camera_manager = CameraManager()
+        self.camera_manager = CameraManager(keyframe_selector=keyframe_selector)
 
         print("Robots positioned using Core API")
 
@@ -61,6 +75,52 @@ class SimulationWorld:
         )
         return cube
 
+    def add_props(
+        self, positions: np.ndarray, sizes: np.ndarray, colors: ColorsLike
+    ) -> PropManager:
+        """
+        Place many cuboid props at once, reusing the pooled prims when possible.
+
+        Args:
+            positions: Prop positions as (N, 3) array
+            sizes: Prop edge lengths as (N, 3) array
+            colors: Sequence of N Color values, a single Color or an (N, 3) array
+
+        Returns:
+            PropManager holding the props
+        """
+        self.prop_manager.spawn(positions, sizes, colors)
+        return self.prop_manager
+
+    def add_random_props(
+        self,
+        count: int,
+        bounds_min: np.ndarray,
+        bounds_max: np.ndarray,
+        size_range: Tuple[float, float] = (0.05, 0.15),
+        rng: Optional[np.random.Generator] = None,
+    ) -> PropManager:
+        """
+        Scatter randomly sized and colored props inside a box.
+
+        Calling this again between episodes re-poses the existing props
+        instead of deleting and recreating them.
+
+        Args:
+            count: Number of props
+            bounds_min: Lower corner [x, y, z] of the spawn volume
+            bounds_max: Upper corner [x, y, z] of the spawn volume
+            size_range: Min and max edge length of each prop
+            rng: Random generator, a fresh default one is used if None
+
+        Returns:
+            PropManager holding the props
+        """
+        positions, sizes, colors = random_layout(
+            count, bounds_min, bounds_max, size_range=size_range, rng=rng
+        )
+        return self.add_props(positions, sizes, colors)
+
     def _add_environment(self, usd_path: Path) -> bool:
         """
         Add an environment to the simulation from a USD file.
@@ -119,25 +179,37 @@ class SimulationWorld:
         for robot in self.robots:
             robot.initialize()
 
-    def run_simulation(self, slowdown_factor: int = 30):
+    def run_simulation(
+        self, slowdown_factor: int = 30, max_frames: Optional[int] = None
+    ):
         """
         Run the main simulation loop.
 
         Args:
             slowdown_factor: Factor to slow down robot animations
+            max_frames: Stop after this many frames, run forever if None
         """
-        # frame = 0
-
-        while True:
-            # Step the simulation
-            self.world.step(render=True)
-
-            # # Capture and save images
-            # if self.camera_manager:
-            #     self.camera_manager.capture_and_save_images(frame)
-
-            # # Animate all robots
-            # for robot in self.robots:
-            #     robot.animate(frame, slowdown_factor)
+        frame = 0
+        recording = (
+            self.camera_manager is not None
+            and self.camera_manager.keyframe_selector is not None
+        )
 
-            # frame += 1
+        try:
+            while max_frames is None or frame < max_frames:
+                # Step the simulation
+                self.world.step(render=True)
+
+                # Capture and save keyframes
+                if recording:
+                    self.camera_manager.capture_and_save_images(frame)  # type: ignore
+
+                # # Animate all robots
+                # for robot in self.robots:
+                #     robot.animate(frame, slowdown_factor)
+
+                frame += 1
+        finally:
+            # Write the keyframe index even if the loop is interrupted
+            if recording and frame > 0:
+                self.camera_manager.save_keyframe_index(frame - 1)  # type: ignore
@@ -0,0 +1,36 @@
+import numpy as np
+
+from keyframe_selector import KeyframeSelector
+
+
+def _flow(moving_fraction: float, speed: float = 5.0) -> np.ndarray:
+    """Motion-vector buffer where the first rows move by speed pixels."""
+    flow = np.zeros((100, 100, 4), dtype=np.float32)
+    flow[: int(100 * moving_fraction), :, 0] = speed
+    return flow
+
+
+def test_all_nan_motion_scores_zero():
+    selector = KeyframeSelector(stride=1)
+    flow = np.full((10, 10, 4), np.nan, dtype=np.float32)
+    assert selector.motion_score(flow) == 0.0
+
+
+def test_small_moving_region_crosses_threshold():
+    selector = KeyframeSelector(stride=1, threshold=0.01)
+    assert selector.motion_score(_flow(0.05)) >= 0.05
+    assert selector.motion_score(_flow(0.0)) == 0.0
+
+
+def test_skipped_and_tail_ranges():
+    selector = KeyframeSelector(stride=1, max_gap=5)
+    recorded = [
+        frame
+        for frame in range(12)
+        if selector.update(frame, _flow(0.5 if frame == 3 else 0.0))
+    ]
+    selector.finalize(11)
+
+    assert recorded == [0, 3, 8]
+    assert selector.skipped_ranges() == [(1, 2), (4, 7), (9, 11)]
+    assert selector.tail_skipped == (9, 11)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from point_cloud import PointCloudGenerator, voxel_downsample
+
+INTRINSICS = np.array([[100.0, 0.0, 32.0], [0.0, 100.0, 24.0], [0.0, 0.0, 1.0]])
+IDENTITY = np.array([1.0, 0.0, 0.0, 0.0])
+
+
+def test_back_projects_known_pixel():
+    depth = np.full((48, 64), np.inf, dtype=np.float32)
+    depth[34, 52] = 2.0
+    rgb = np.zeros((48, 64, 3), dtype=np.uint8)
+    rgb[34, 52] = (10, 20, 30)
+
+    points, colors = PointCloudGenerator().generate(
+        depth, INTRINSICS, np.array([1.0, 2.0, 3.0]), IDENTITY, rgb=rgb
+    )
+
+    # u=52, v=34 -> x = (52 - 32) / 100 * 2, y = (34 - 24) / 100 * 2
+    np.testing.assert_allclose(points, [[1.4, 2.2, 5.0]], rtol=1e-6)
+    assert colors is not None and colors.dtype == np.float32
+    np.testing.assert_array_equal(colors, [[10.0, 20.0, 30.0]])
+
+
+def test_rotation_is_applied():
+    depth = np.zeros((48, 64), dtype=np.float32)
+    depth[24, 32] = 1.0
+    # 90 degrees around x maps the optical axis (0, 0, 1) onto (0, -1, 0)
+    half = np.sqrt(0.5)
+    points, _ = PointCloudGenerator().generate(
+        depth, INTRINSICS, np.zeros(3), np.array([half, half, 0.0, 0.0])
+    )
+    np.testing.assert_allclose(points, [[0.0, -1.0, 0.0]], atol=1e-6)
+
+
+def test_roi_is_clamped_to_image():
+    depth = np.ones((720, 1280), dtype=np.float32)
+    generator = PointCloudGenerator(roi=(1200, 700, 1400, 800))
+    points, _ = generator.generate(depth, INTRINSICS, np.zeros(3), IDENTITY)
+    assert points.shape == (80 * 20, 3)
+
+
+def test_roi_outside_image_raises():
+    depth = np.ones((48, 64), dtype=np.float32)
+    generator = PointCloudGenerator(roi=(100, 100, 200, 200))
+    with pytest.raises(ValueError):
+        generator.generate(depth, INTRINSICS, np.zeros(3), IDENTITY)
+
+
+def test_voxel_centroids():
+    points = np.array(
+        [[0.01, 0.01, 0.01], [0.03, 0.03, 0.03], [0.51, 0.01, 0.01]]
+    )
+    colors = np.array([[0, 0, 0], [255, 255, 255], [10, 10, 10]], dtype=np.uint8)
+
+    down, down_colors = voxel_downsample(points, 0.1, colors)
+
+    order = np.argsort(down[:, 0])
+    np.testing.assert_allclose(down[order], [[0.02, 0.02, 0.02], [0.51, 0.01, 0.01]])
+    assert down_colors is not None and down_colors.dtype == np.float32
+    np.testing.assert_allclose(down_colors[order], [[127.5] * 3, [10.0] * 3])
+
+
+def test_voxel_keys_do_not_collide_on_wide_clouds():
+    points = np.array([[0.0, 0.0075, 0.0], [0.0, 0.0, 10485.76]])
+    down, _ = voxel_downsample(points, 0.005)
+    assert len(down) == 2